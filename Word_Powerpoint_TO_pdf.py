@@ -4,93 +4,453 @@
 # Open command prompt as Administrator and run:
 # streamlit run Word_Powerpoint_TO_pdf.py
 # Requirements:
-# pip install streamlit python-docx pywin32 reportlab pathlib2
+# pip install "streamlit>=1.43" python-docx pywin32 reportlab pathlib2
+import atexit
+import io
 import os
+import shutil
+import hashlib
 from pathlib import Path
-from docx import Document
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
 import streamlit as st
 from mimetypes import guess_type
 import zipfile
 import tempfile
-import pythoncom
-import win32com.client
-from io import BytesIO
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from itertools import chain, repeat
+from office_converter import (OFFICE_AVAILABLE, UNO_AVAILABLE, WORD_EXTS, PPT_EXTS, init_worker, convert_in_worker,
+                              convert_with_soffice, LibreOfficeDaemon, fast_convert_simple_docx)
+
+# Optional: zlib-ng's SIMD CRC32 is much faster than zlib's for the large,
+# stored PDF entries of the result ZIPs (pip install zlib-ng)
+try:
+    from zlib_ng import zlib_ng
+    zipfile.crc32 = zlib_ng.crc32
+except ImportError:
+    pass
+
+# Word can run several independent instances (capped, as each one is a full Word
+# process); PowerPoint is a single-instance COM server, so extra PowerPoint
+# workers would only queue behind each other
+WORD_WORKERS = min(4, os.cpu_count() or 1)
+POWERPOINT_WORKERS = 1
+
+# Persistent LibreOffice processes converting in parallel (UNO backend only)
+LIBREOFFICE_INSTANCES = min(2, os.cpu_count() or 1)
+
+# Threads extracting ZIP members and saving folder uploads in parallel
+# (decompression, hashing and file writes release the GIL)
+EXTRACT_WORKERS = min(8, os.cpu_count() or 1)
+
+# How each supported file extension is handled while walking a folder
+FILE_KINDS = {
+    **dict.fromkeys(WORD_EXTS, 'word'),
+    **dict.fromkeys(PPT_EXTS, 'powerpoint'),
+    '.pdf': 'pdf',
+}
+
+# Folders that are never walked (besides hidden ones): macOS resource forks in ZIPs
+IGNORED_DIRS = frozenset({'__MACOSX'})
+
+# Unsupported files that are skipped silently instead of being reported
+QUIET_SKIP_EXTS = frozenset({'.txt', '.md', '.log'})
+
+# Already deflate-compressed formats: stored as-is in result ZIPs, since
+# compressing them again costs CPU for almost no size reduction
+STORED_EXTENSIONS = frozenset({'.pdf', '.docx', '.pptx', '.zip'})
+
+# RAM-backed temp location for the individual-files branch (Linux), else the default.
+# Only used when the batch fits: it is often small (64 MiB by default in Docker).
+RAM_TEMP_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+# Characters replaced in extracted file names (invalid on Windows)
+WINDOWS_INVALID_CHARS = frozenset(':*?"<>|')
+
+# Uploads and ZIP members are streamed to disk in chunks of this size
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Result ZIPs stay in memory up to this size, then spill to a temporary file
+ZIP_SPOOL_SIZE = 64 << 20
+
+# Conversion backends offered in the UI
+BACKEND_OFFICE = "Microsoft Office"
+BACKEND_LIBREOFFICE = "LibreOffice"
+
+
+class OfficePools:
+    """Long-lived worker pools for 'word' and 'powerpoint', created on first use.
+
+    Their workers keep their Office instance open (see convert_in_worker), so
+    Word and PowerPoint start once per worker instead of once per conversion.
+    A pool that broke (a worker process died) is shut down and replaced.
+    """
+
+    def __init__(self):
+        self.pools = {}
+        self.lock = threading.Lock()
+
+    def get(self, kind):
+        """Return the current pool for kind, starting one if needed."""
+        with self.lock:
+            pool = self.pools.get(kind)
+            if pool is None:
+                max_workers = WORD_WORKERS if kind == 'word' else POWERPOINT_WORKERS
+                pool = ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker)
+                self.pools[kind] = pool
+            return pool
+
+    def discard(self, kind, pool):
+        """Shut down a broken pool; the next get() for kind starts a new one."""
+        with self.lock:
+            if self.pools.get(kind) is pool:
+                del self.pools[kind]
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, kind, file_path, output_dir):
+        """Queue one conversion; returns (pool, future)."""
+        pool = self.get(kind)
+        try:
+            return pool, pool.submit(convert_in_worker, file_path, output_dir, kind)
+        except BrokenProcessPool:
+            self.discard(kind, pool)
+            pool = self.get(kind)
+            return pool, pool.submit(convert_in_worker, file_path, output_dir, kind)
 
-def convert_doc_to_pdf(doc_path, pdf_path):
-    """Convert a DOC/DOCX file to a PDF using Microsoft Word (Windows only)."""
-    pythoncom.CoInitialize()
-    
+
+@st.cache_resource(show_spinner=False)
+def get_office_pools():
+    """Return the OfficePools shared by all reruns and sessions.
+
+    COM objects themselves cannot be cached here: they belong to the thread
+    that created them, and Streamlit runs each rerun on a new thread.
+    """
+    return OfficePools()
+
+
+def convert_with_office(word_jobs, powerpoint_jobs):
+    """Convert jobs in Office worker processes, yielding (file_path, pdf_path, error) as each finishes."""
+    pools = get_office_pools()
+    futures = {}
     try:
-        word = win32com.client.Dispatch("Word.Application")
-        word.Visible = False
+        for kind, jobs in (('word', word_jobs), ('powerpoint', powerpoint_jobs)):
+            for file_path, output_dir in jobs:
+                pool, future = pools.submit(kind, file_path, output_dir)
+                futures[future] = (file_path, kind, pool)
         
-        try:
-            doc = word.Documents.Open(str(doc_path))
-            doc.SaveAs(str(pdf_path), FileFormat=17)  # 17 is the PDF format ID in Word
-            doc.Close()
-        except Exception as e:
-            raise ValueError(f"Could not convert {doc_path}: {e}")
-        finally:
-            word.Quit()
+        for future in as_completed(futures):
+            file_path, kind, pool = futures[future]
+            try:
+                yield file_path, future.result(), None
+            except BrokenProcessPool as e:
+                # A worker died (e.g. Office crashed): replace only that kind's pool
+                pools.discard(kind, pool)
+                yield file_path, None, e
+            except Exception as e:
+                yield file_path, None, e
+    finally:
+        # Runs when the generator is closed early too (e.g. a rerun stops this
+        # one): drop queued jobs so they don't hold up the shared pools
+        for future in futures:
+            future.cancel()
+
+
+@st.cache_resource(show_spinner=False)
+def get_libreoffice_daemons():
+    """Return a queue of LibreOfficeDaemon instances shared by all reruns and sessions.
+
+    Each daemon starts its LibreOffice process on first use and keeps it
+    running, so later conversions skip the start-up entirely.
+    """
+    daemons = queue.Queue()
+    for _ in range(LIBREOFFICE_INSTANCES):
+        daemon = LibreOfficeDaemon()
+        atexit.register(daemon.__exit__, None, None, None)
+        daemons.put(daemon)
+    return daemons
+
+
+def convert_with_libreoffice_daemon(file_path, output_dir):
+    """Convert one file with a free LibreOffice daemon, waiting for one if all are busy."""
+    daemons = get_libreoffice_daemons()
+    daemon = daemons.get()
+    try:
+        return daemon.convert(file_path, output_dir)
     finally:
-        pythoncom.CoUninitialize()
+        daemons.put(daemon)
+
 
+def convert_with_libreoffice(jobs):
+    """Convert jobs with headless LibreOffice, yielding (file_path, pdf_path, error).
 
-def convert_pptx_to_pdf(pptx_path, pdf_path):
-    """Convert a PPT/PPTX file to a PDF using Microsoft PowerPoint (Windows only)."""
-    pythoncom.CoInitialize()
+    With pyuno available, files are converted one by one in persistent
+    LibreOffice daemons; otherwise there is one soffice run per output directory.
+    """
+    if UNO_AVAILABLE:
+        with ThreadPoolExecutor(max_workers=LIBREOFFICE_INSTANCES) as pool:
+            futures = {pool.submit(convert_with_libreoffice_daemon, file_path, output_dir): file_path
+                       for file_path, output_dir in jobs}
+            for future in as_completed(futures):
+                try:
+                    yield futures[future], future.result(), None
+                except Exception as e:
+                    yield futures[future], None, e
+        return
     
-    try:
-        powerpoint = win32com.client.Dispatch("PowerPoint.Application")
-        powerpoint.Visible = True  # PowerPoint sometimes needs to be visible
-        
+    jobs_by_dir = {}
+    for file_path, output_dir in jobs:
+        jobs_by_dir.setdefault(output_dir, []).append(file_path)
+    
+    for output_dir, file_paths in jobs_by_dir.items():
         try:
-            presentation = powerpoint.Presentations.Open(str(pptx_path))
-            presentation.SaveAs(str(pdf_path), FileFormat=32)  # 32 is the PDF format ID in PowerPoint
-            presentation.Close()
+            results = convert_with_soffice(file_paths, output_dir)
         except Exception as e:
-            raise ValueError(f"Could not convert {pptx_path}: {e}")
-        finally:
-            powerpoint.Quit()
-    finally:
-        pythoncom.CoUninitialize()
+            for file_path in file_paths:
+                yield file_path, None, e
+            continue
+        
+        for file_path in file_paths:
+            pdf_path = results[file_path]
+            if pdf_path is None:
+                yield file_path, None, ValueError("LibreOffice did not produce a PDF")
+            else:
+                yield file_path, pdf_path, None
+
+
+class Reporter:
+    """Collect per-file status messages and render them in batches.
+
+    Every Streamlit call is a round-trip to the browser, so messages are
+    buffered and flushed every flush_every messages or flush_interval
+    seconds instead of being sent one by one. The optional progress bar is
+    updated on the same flushes.
+    """
+
+    def __init__(self, flush_every=10, flush_interval=0.5):
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.container = st.container()
+        self.pending = []
+        self.last_flush = time.monotonic()
+        self.progress_bar = None
+        self.total = 0
+        self.done = 0
+
+    def start_progress(self, total):
+        """Show a progress bar for total files, advanced with advance()."""
+        self.total = total
+        self.done = 0
+        self.progress_bar = self.container.progress(0.0, text=f"0/{total} files converted")
+
+    def advance(self, count=1):
+        """Mark count more files as finished; shown on the next flush."""
+        self.done += count
+
+    def log(self, level, message):
+        """Queue a message; level is 'success', 'info' or 'warning'."""
+        self.pending.append((level, message))
+        if (len(self.pending) >= self.flush_every
+                or time.monotonic() - self.last_flush >= self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        """Render all queued messages: one block for warnings, one for the rest."""
+        warnings = [message for level, message in self.pending if level == 'warning']
+        others = [message for level, message in self.pending if level != 'warning']
+        if others:
+            self.container.markdown("  \n".join(others))
+        if warnings:
+            self.container.warning("  \n".join(warnings))
+        if self.progress_bar is not None and self.total:
+            self.progress_bar.progress(min(self.done / self.total, 1.0),
+                                       text=f"{self.done}/{self.total} files converted")
+        self.pending = []
+        self.last_flush = time.monotonic()
+
+
+def link_or_copy(src, dst):
+    """Hard-link src to dst, falling back to a real copy (e.g. across filesystems).
+
+    The fallback is copy2 rather than copyfile, so the copy keeps the original
+    modification time that becomes its date in the result ZIP, as a link does.
+    """
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
 
 
-def is_valid_office_file(file_path):
-    """Check if the file is a valid Office document based on its extension."""
-    return file_path.suffix.lower() in ['.doc', '.docx', '.ppt', '.pptx']
+def claim_output(claimed, pdf_path, original):
+    """Reserve pdf_path for the file shown as original.
 
+    claimed maps output paths to the original already producing them.
+    Returns that other original if pdf_path is taken (e.g. x.doc and x.docx,
+    or equal names with preserve_structure off), else None.
+    """
+    # Compared case-insensitively on Windows, like the file system does
+    owner = claimed.setdefault(os.path.normcase(os.fspath(pdf_path)), original)
+    return None if owner == original else owner
 
-def convert_file_to_pdf(file_path, output_dir):
-    """Convert a single office file to PDF based on its type."""
-    file_path = Path(file_path)
-    output_dir = Path(output_dir)
+
+def convert_office_jobs(jobs, output_base_dir, reporter, backend=BACKEND_OFFICE, on_output=None, fast_docx=False,
+                        digests=None):
+    """Convert collected Office jobs and return (converted_files, skipped_files).
+
+    jobs maps 'word' / 'powerpoint' to lists of (file_path, output_dir, original)
+    tuples, where original is the name shown to the user. Output directories
+    must already exist; the caller flushes reporter. on_output, fast_docx and
+    digests are as in process_folder_recursive.
+    """
+    converted_files = []
+    skipped_files = []
+    originals = {}
+    for kind in jobs:
+        for file_path, _, original in jobs[kind]:
+            originals[file_path] = original
+    jobs = {kind: [(file_path, output_dir) for file_path, output_dir, _ in kind_jobs]
+            for kind, kind_jobs in jobs.items()}
     
-    # Create output directory if it doesn't exist
-    output_dir.mkdir(parents=True, exist_ok=True)
+    if originals:
+        reporter.start_progress(len(originals))
     
-    # Generate PDF path
-    pdf_path = output_dir / f"{file_path.stem}.pdf"
+    # Files with identical content are converted once; the copies reuse that PDF
+    duplicates = {}  # converted file_path -> [(duplicate file_path, output_dir)]
+    if digests:
+        for kind, kind_jobs in jobs.items():
+            first_by_digest = {}
+            unique_jobs = []
+            for file_path, output_dir in kind_jobs:
+                digest = digests.get(file_path)
+                if digest is not None and digest in first_by_digest:
+                    duplicates.setdefault(first_by_digest[digest], []).append((file_path, output_dir))
+                    continue
+                if digest is not None:
+                    first_by_digest[digest] = file_path
+                unique_jobs.append((file_path, output_dir))
+            jobs[kind] = unique_jobs
     
-    try:
-        if file_path.suffix.lower() in ['.doc', '.docx']:
-            convert_doc_to_pdf(file_path, pdf_path)
-        elif file_path.suffix.lower() in ['.ppt', '.pptx']:
-            convert_pptx_to_pdf(file_path, pdf_path)
+    # Plain-text .docx files skip Office/LibreOffice entirely when fast mode is on.
+    # They are tried on a pool of threads (unzipping and XML parsing release the
+    # GIL for much of the work) so a large batch is not parsed one file at a time.
+    fast_results = []
+    if fast_docx:
+        docx_paths = [file_path for file_path, _ in jobs['word'] if file_path.suffix.lower() == '.docx']
+        pdf_paths = [output_dir / f"{file_path.stem}.pdf"
+                     for file_path, output_dir in jobs['word'] if file_path.suffix.lower() == '.docx']
+        with ThreadPoolExecutor(max_workers=EXTRACT_WORKERS) as pool:
+            rendered = list(pool.map(fast_convert_simple_docx, docx_paths, pdf_paths))
+        fast_results = [(file_path, pdf_path, None)
+                        for file_path, pdf_path, ok in zip(docx_paths, pdf_paths, rendered) if ok]
+        fast_paths = {file_path for file_path, _, _ in fast_results}
+        jobs['word'] = [(file_path, output_dir) for file_path, output_dir in jobs['word']
+                        if file_path not in fast_paths]
+    
+    if backend == BACKEND_LIBREOFFICE:
+        results = convert_with_libreoffice(jobs['word'] + jobs['powerpoint'])
+    else:
+        results = convert_with_office(jobs['word'], jobs['powerpoint'])
+    results = chain(fast_results, results)
+    
+    for file_path, pdf_path, error in results:
+        original = originals[file_path]
+        reporter.advance()
+        if error is None:
+            converted_files.append({
+                'original': original,
+                'pdf': str(pdf_path.relative_to(output_base_dir)),
+                'type': file_path.suffix.upper()
+            })
+            if on_output is not None:
+                on_output(pdf_path)
+            
+            reporter.log('success', f"✅ Converted: {original} → {pdf_path.name}")
         else:
-            raise ValueError(f"Unsupported file type: {file_path.suffix}")
+            error_msg = f"❌ Failed to convert '{original}': {error}"
+            reporter.log('warning', error_msg)
+            skipped_files.append(original)
         
-        return pdf_path
-    except Exception as e:
-        raise ValueError(f"Failed to convert {file_path.name}: {e}")
+        for copy_path, copy_dir in duplicates.get(file_path, []):
+            copy_original = originals[copy_path]
+            reporter.advance()
+            if error is not None:
+                reporter.log('warning', f"❌ Failed to convert '{copy_original}': {error}")
+                skipped_files.append(copy_original)
+                continue
+            
+            try:
+                copy_pdf_path = copy_dir / f"{copy_path.stem}.pdf"
+                if copy_pdf_path != pdf_path:
+                    link_or_copy(pdf_path, copy_pdf_path)
+                    if on_output is not None:
+                        on_output(copy_pdf_path)
+                
+                converted_files.append({
+                    'original': copy_original,
+                    'pdf': str(copy_pdf_path.relative_to(output_base_dir)),
+                    'type': copy_path.suffix.upper()
+                })
+                reporter.log('success', f"♻️ Reused PDF for identical file: {copy_original} → {copy_pdf_path.name}")
+            except Exception as e:
+                reporter.log('warning', f"❌ Failed to copy PDF for '{copy_original}': {e}")
+                skipped_files.append(copy_original)
+    
+    return converted_files, skipped_files
+
+
+def process_files(file_paths, output_dir, backend=BACKEND_OFFICE, on_output=None, reporter=None, fast_docx=False):
+    """Convert a flat list of Office files into output_dir without walking any folder."""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    if reporter is None:
+        reporter = Reporter()
+    
+    jobs = {'word': [], 'powerpoint': []}
+    skipped_files = []
+    claimed = {}
+    for file_path in map(Path, file_paths):
+        kind = FILE_KINDS.get(file_path.suffix.lower())
+        if kind not in jobs:
+            skipped_files.append(file_path.name)
+            continue
+        
+        pdf_name = f"{file_path.stem}.pdf"
+        owner = claim_output(claimed, output_dir / pdf_name, file_path.name)
+        if owner is not None:
+            reporter.log('warning', f"❌ Skipped '{file_path.name}': {pdf_name} is already produced by '{owner}'")
+            skipped_files.append(file_path.name)
+            continue
+        jobs[kind].append((file_path, output_dir, file_path.name))
+    
+    converted_files, failed = convert_office_jobs(
+        jobs,
+        output_dir,
+        reporter,
+        backend=backend,
+        on_output=on_output,
+        fast_docx=fast_docx
+    )
+    reporter.flush()
+    return converted_files, skipped_files + failed
+
+
+def process_folder_recursive(folder_path, output_base_dir, preserve_structure=True, backend=BACKEND_OFFICE,
+                             on_output=None, reporter=None, fast_docx=False, digests=None):
+    """Recursively process all Office files in a folder and its subfolders.
 
+    With fast_docx, text-only .docx files are rendered directly with reportlab
+    instead of going through the conversion backend. digests optionally maps
+    file paths to content hashes; files with the same hash are converted once.
 
-def process_folder_recursive(folder_path, output_base_dir, preserve_structure=True):
-    """Recursively process all Office files in a folder and its subfolders."""
+    If given, on_output is called with the path of every PDF written to
+    output_base_dir as soon as it is ready (see ZipStreamWriter).
+    Per-file status messages go to reporter (a new Reporter by default).
+    """
     folder_path = Path(folder_path)
     output_base_dir = Path(output_base_dir)
+    if reporter is None:
+        reporter = Reporter()
     
     if not folder_path.is_dir():
         raise ValueError("The provided path is not a folder.")
@@ -98,74 +458,130 @@ def process_folder_recursive(folder_path, output_base_dir, preserve_structure=Tr
     converted_files = []
     skipped_files = []
     
-    # Walk through all files and subdirectories
-    for file_path in folder_path.rglob('*'):
-        if file_path.is_file() and file_path.name != "uploaded.zip":
+    # Office files are collected first so each application is started only once
+    jobs = {'word': [], 'powerpoint': []}
+    # Output directories already created (each is created once, not per file)
+    created_dirs = set()
+    # Output PDF paths already taken, so no file overwrites another one's PDF
+    claimed = {}
+    
+    # Walk through all files and subdirectories in a single pass
+    for dirpath, dirnames, filenames in os.walk(folder_path):
+        # Prune hidden and system folders here so their contents are never visited
+        dirnames[:] = [d for d in dirnames if not d.startswith('.') and d not in IGNORED_DIRS]
+        
+        # Relative folder and output directory are computed once per directory
+        relative_dir = os.path.relpath(dirpath, folder_path)
+        if preserve_structure:
+            # Preserve folder structure
+            output_dir = output_base_dir / relative_dir
+        else:
+            # Put all files in the base output directory
+            output_dir = output_base_dir
+        
+        for name in filenames:
+            # Cheaper than Path.suffix / splitext; a leading dot (".hidden") is not a suffix
+            dot = name.rfind('.')
+            suffix = name[dot:].lower() if dot > 0 else ''
+            kind = FILE_KINDS.get(suffix)
+            relative_name = name if relative_dir == os.curdir else os.path.join(relative_dir, name)
             
-            if is_valid_office_file(file_path):
-                try:
-                    # Determine output directory
-                    if preserve_structure:
-                        # Preserve folder structure
-                        relative_path = file_path.parent.relative_to(folder_path)
-                        output_dir = output_base_dir / relative_path
-                    else:
-                        # Put all files in the base output directory
-                        output_dir = output_base_dir
-                    
-                    # Convert file
-                    pdf_path = convert_file_to_pdf(file_path, output_dir)
-                    converted_files.append({
-                        'original': str(file_path.relative_to(folder_path)),
-                        'pdf': str(pdf_path.relative_to(output_base_dir)),
-                        'type': file_path.suffix.upper()
-                    })
-                    
-                    st.success(f"✅ Converted: {file_path.relative_to(folder_path)} → {pdf_path.name}")
-                    
-                except Exception as e:
-                    error_msg = f"❌ Failed to convert '{file_path.relative_to(folder_path)}': {e}"
-                    st.warning(error_msg)
-                    skipped_files.append(str(file_path.relative_to(folder_path)))
+            if kind is not None:
+                pdf_name = name if kind == 'pdf' else f"{name[:dot]}.pdf"
+                owner = claim_output(claimed, output_dir / pdf_name, relative_name)
+                if owner is not None:
+                    reporter.log('warning', f"❌ Skipped '{relative_name}': {pdf_name} is already produced by '{owner}'")
+                    skipped_files.append(relative_name)
+                    continue
+                
+                if output_dir not in created_dirs:
+                    output_dir.mkdir(parents=True, exist_ok=True)
+                    created_dirs.add(output_dir)
             
-            elif file_path.suffix.lower() == '.pdf':
+            if kind in jobs:
+                jobs[kind].append((Path(dirpath, name), output_dir, relative_name))
+            
+            elif kind == 'pdf':
                 # Copy existing PDF files
                 try:
-                    if preserve_structure:
-                        relative_path = file_path.parent.relative_to(folder_path)
-                        output_dir = output_base_dir / relative_path
-                    else:
-                        output_dir = output_base_dir
-                    
-                    output_dir.mkdir(parents=True, exist_ok=True)
-                    pdf_copy_path = output_dir / file_path.name
+                    pdf_copy_path = output_dir / name
                     
                     # Copy the PDF file
-                    import shutil
-                    shutil.copy2(file_path, pdf_copy_path)
+                    link_or_copy(os.path.join(dirpath, name), pdf_copy_path)
                     
                     converted_files.append({
-                        'original': str(file_path.relative_to(folder_path)),
+                        'original': relative_name,
                         'pdf': str(pdf_copy_path.relative_to(output_base_dir)),
                         'type': 'PDF (copied)'
                     })
+                    if on_output is not None:
+                        on_output(pdf_copy_path)
                     
-                    st.info(f"📄 Copied PDF: {file_path.relative_to(folder_path)}")
+                    reporter.log('info', f"📄 Copied PDF: {relative_name}")
                     
                 except Exception as e:
-                    error_msg = f"❌ Failed to copy PDF '{file_path.relative_to(folder_path)}': {e}"
-                    st.warning(error_msg)
-                    skipped_files.append(str(file_path.relative_to(folder_path)))
+                    error_msg = f"❌ Failed to copy PDF '{relative_name}': {e}"
+                    reporter.log('warning', error_msg)
+                    skipped_files.append(relative_name)
             
             else:
                 # Skip unsupported file types (but don't show warning for common system files)
-                if not file_path.name.startswith('.') and file_path.suffix.lower() not in ['.txt', '.md', '.log']:
-                    skipped_files.append(str(file_path.relative_to(folder_path)))
+                if not name.startswith('.') and suffix not in QUIET_SKIP_EXTS:
+                    skipped_files.append(relative_name)
     
+    converted, failed = convert_office_jobs(
+        jobs,
+        output_base_dir,
+        reporter,
+        backend=backend,
+        on_output=on_output,
+        fast_docx=fast_docx,
+        digests=digests
+    )
+    converted_files.extend(converted)
+    skipped_files.extend(failed)
+    
+    reporter.flush()
     return converted_files, skipped_files
 
 
-def process_uploaded_files_with_structure(uploaded_files, preserve_structure=True):
+def upload_temp_dir(uploaded_files):
+    """Return RAM_TEMP_DIR if it has room for the uploads and their PDFs, else None (the default)."""
+    if RAM_TEMP_DIR is None:
+        return None
+    try:
+        free = shutil.disk_usage(RAM_TEMP_DIR).free
+    except OSError:
+        return None
+    # The inputs plus roughly as much again for the converted PDFs
+    needed = 2 * sum(uploaded_file.size for uploaded_file in uploaded_files)
+    return RAM_TEMP_DIR if needed < free else None
+
+
+def save_uploaded_file(uploaded_file, file_path):
+    """Stream an uploaded file to disk one UPLOAD_CHUNK_SIZE chunk at a time.
+
+    Returns the SHA-256 digest of the content, computed while copying.
+    Streamlit keeps uploads in memory with no file descriptor, so kernel-side
+    copies such as os.sendfile cannot be used; at most one chunk of the
+    upload is copied at a time.
+    """
+    digest = hashlib.sha256()
+    # Chunked read() rather than getbuffer(): a BytesIO shares the uploaded bytes
+    # until a buffer is exported, which would copy the whole file
+    uploaded_file.seek(0)
+    with open(file_path, "wb") as f:
+        while True:
+            chunk = uploaded_file.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+            f.write(chunk)
+    return digest.digest()
+
+
+def process_uploaded_files_with_structure(uploaded_files, preserve_structure=True, backend=BACKEND_OFFICE,
+                                          fast_docx=False):
     """Process uploaded files and attempt to recreate folder structure from file names."""
     with tempfile.TemporaryDirectory() as temp_dir:
         input_dir = Path(temp_dir) / "input"
@@ -173,7 +589,10 @@ def process_uploaded_files_with_structure(uploaded_files, preserve_structure=Tru
         input_dir.mkdir()
         output_dir.mkdir()
         
-        # Save uploaded files, creating directory structure from file names
+        # Save uploaded files, creating directory structure from file names.
+        # Later uploads with the same path (compared with normcase, as on
+        # Windows A.docx and a.docx are one file) replace earlier ones.
+        uploads = {}
         for uploaded_file in uploaded_files:
             file_name = uploaded_file.name
             
@@ -188,18 +607,35 @@ def process_uploaded_files_with_structure(uploaded_files, preserve_structure=Tru
             else:
                 file_path = input_dir / file_name
             
-            # Save file
-            with open(file_path, "wb") as f:
-                f.write(uploaded_file.getvalue())
-        
-        # Convert files
-        converted_files, skipped_files = process_folder_recursive(
-            input_dir, 
-            output_dir, 
-            preserve_structure=preserve_structure
-        )
+            uploads[os.path.normcase(file_path)] = (file_path, uploaded_file)
         
-        return converted_files, skipped_files, output_dir
+        # Write the files on a pool of threads (hashing and file writes release
+        # the GIL). Content digests let identical uploads be converted only once.
+        paths = [file_path for file_path, _ in uploads.values()]
+        files = [uploaded_file for _, uploaded_file in uploads.values()]
+        with ThreadPoolExecutor(max_workers=EXTRACT_WORKERS) as pool:
+            digests = dict(zip(paths, pool.map(save_uploaded_file, files, paths)))
+        
+        # Convert files, zipping each PDF as soon as it is ready. The archive is
+        # a spooled temporary file so it outlives the temporary directory.
+        result_zip = tempfile.SpooledTemporaryFile(max_size=ZIP_SPOOL_SIZE, suffix=".zip")
+        try:
+            with ZipStreamWriter(result_zip, output_dir) as zip_writer:
+                converted_files, skipped_files = process_folder_recursive(
+                    input_dir, 
+                    output_dir, 
+                    preserve_structure=preserve_structure,
+                    backend=backend,
+                    on_output=zip_writer.add,
+                    fast_docx=fast_docx,
+                    digests=digests
+                )
+        except Exception:
+            result_zip.close()
+            raise
+        
+        result_zip.seek(0)
+        return converted_files, skipped_files, result_zip
 
 
 def handle_folder_upload_alternative():
@@ -254,38 +690,200 @@ def create_folder_structure_info(uploaded_files):
             folder_structure['_files'].append(file_name)
     
     if folder_structure:
-        st.write("**📁 Detected folder structure:**")
-        display_folder_structure(folder_structure, "")
-
-
-def display_folder_structure(structure, prefix=""):
-    """Recursively display folder structure."""
-    for key, value in structure.items():
+        # Rendered as one markdown block rather than one element per node
+        lines = ["**📁 Detected folder structure:**"]
+        lines.extend(format_folder_structure(folder_structure))
+        st.markdown("  \n".join(lines))
+
+
+def format_folder_structure(structure, indent="&nbsp;&nbsp;"):
+    """Return the folder structure as indented markdown lines (iterative, no recursion)."""
+    lines = []
+    stack = [(iter(structure.items()), "")]
+    while stack:
+        items, prefix = stack[-1]
+        entry = next(items, None)
+        if entry is None:
+            stack.pop()
+            continue
+        
+        key, value = entry
         if key == '_files':
             for file_name in value:
-                st.write(f"{prefix}📄 {file_name}")
+                lines.append(f"{prefix}📄 {file_name}")
         else:
-            st.write(f"{prefix}📁 {key}/")
-            display_folder_structure(value, prefix + "  ")
-
-
-def create_zip_from_folder(folder_path, zip_name="converted_files.zip"):
-    zip_buffer = BytesIO()
+            lines.append(f"{prefix}📁 {key}/")
+            stack.append((iter(value.items()), prefix + indent))
+    return lines
+
+
+def zip_compress_type(file_path):
+    """Return the ZIP compression to use for a file based on its extension."""
+    if Path(file_path).suffix.lower() in STORED_EXTENSIONS:
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+def zip_add_file(zipf, file_path, arcname):
+    """Add a file to an open ZipFile, copying it in UPLOAD_CHUNK_SIZE chunks.
+
+    ZipFile.write copies in 8 KiB chunks, which makes large stored PDFs pay
+    for thousands of small reads, CRC updates and writes.
+    """
+    zinfo = zipfile.ZipInfo.from_file(file_path, arcname)
+    zinfo.compress_type = zip_compress_type(file_path)
+    with open(file_path, "rb") as src, zipf.open(zinfo, "w") as dst:
+        shutil.copyfileobj(src, dst, length=UPLOAD_CHUNK_SIZE)
+
+
+def zip_download_data(zip_file):
+    """Wrap a result archive so st.download_button accepts it as a binary file.
+
+    Streamlit only reads BytesIO, BufferedReader and RawIOBase objects, and
+    temporary files are none of these. A SpooledTemporaryFile is passed as
+    the BytesIO or real file it currently holds: before Python 3.11 it lacks
+    the io methods BufferedReader needs.
+    """
+    zip_file.seek(0)
+    buffer = getattr(zip_file, "_file", zip_file)
+    if isinstance(buffer, io.BytesIO):
+        return buffer
+    return io.BufferedReader(buffer)
+
+
+class ZipStreamWriter:
+    """Write files into a ZIP archive from a background thread as soon as they are ready.
+
+    Lets the result archive be assembled while the remaining files are still
+    being converted, instead of zipping the whole output folder at the end.
+    One thread is enough: ZipFile allows a single open write handle, and the
+    reads, CRC32 and writes it does already overlap with the conversion.
+    """
+
+    def __init__(self, fileobj, base_dir):
+        self.fileobj = fileobj
+        self.base_dir = Path(base_dir)
+        self.to_zip = queue.Queue()
+        self.error = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.to_zip.put(None)  # Sentinel: no more files
+        self.thread.join()
+        if self.error is not None and exc_type is None:
+            raise self.error
+
+    def add(self, file_path):
+        """Queue a file (inside base_dir) to be added to the archive; repeated paths are added once."""
+        self.to_zip.put(Path(file_path))
+
+    def _run(self):
+        written = set()
+        try:
+            with zipfile.ZipFile(self.fileobj, 'w', zipfile.ZIP_DEFLATED) as zipf:
+                while True:
+                    file_path = self.to_zip.get()
+                    if file_path is None:
+                        break
+                    arcname = file_path.relative_to(self.base_dir).as_posix()
+                    if arcname in written:
+                        continue  # A second entry with the same name would be a duplicate in the ZIP
+                    written.add(arcname)
+                    zip_add_file(zipf, file_path, arcname)
+        except Exception as e:
+            self.error = e
+
+
+def safe_member_path(base_dir, member_name):
+    """Map a ZIP member name to a path inside base_dir, or None if nothing is left of it.
+
+    Drive letters, absolute paths, '.' / '..' components and characters that
+    are invalid in Windows file names are neutralised, as ZipFile.extract does.
+    """
+    parts = []
+    for part in member_name.replace('\\', '/').split('/'):
+        if not parts and part.endswith(':'):
+            continue  # Drive letter
+        if os.name == 'nt':
+            part = ''.join('_' if char in WINDOWS_INVALID_CHARS else char for char in part).rstrip('.')
+        if part in ('', '.', '..'):
+            continue
+        parts.append(part)
+    if not parts:
+        return None
+    return Path(base_dir, *parts)
+
+
+def extract_member(zip_ref, info, target):
+    """Stream one ZIP member to target, one chunk at a time.
+
+    Returns the SHA-256 digest of Office files, computed while copying, else None.
+    """
+    with zip_ref.open(info) as src, open(target, "wb") as dst:
+        if FILE_KINDS.get(target.suffix.lower()) not in ('word', 'powerpoint'):
+            shutil.copyfileobj(src, dst, length=UPLOAD_CHUNK_SIZE)
+            return None
+        
+        digest = hashlib.sha256()
+        while True:
+            chunk = src.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+            dst.write(chunk)
+        return digest.digest()
+
+
+def extract_zip(zip_ref, extract_dir):
+    """Extract every file in an open ZipFile into extract_dir using a pool of threads.
+
+    Returns a dict mapping each extracted Office file to the SHA-256 digest of
+    its content (see process_folder_recursive).
+    """
+    # Directories are created up front so the threads only open and write files.
+    # Later members with the same target replace earlier ones, as in a serial extract;
+    # targets are compared with normcase, as A.docx and a.docx are one file on Windows.
+    created_dirs = set()
+    members = {}
+    for info in zip_ref.infolist():
+        if info.is_dir():
+            continue
+        
+        target = safe_member_path(extract_dir, info.filename)
+        if target is None:
+            continue
+        
+        if target.parent not in created_dirs:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            created_dirs.add(target.parent)
+        members[os.path.normcase(target)] = (target, info)
     
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for file_path in folder_path.rglob('*'):
-            if file_path.is_file():
-                # Add file to zip with relative path
-                arcname = file_path.relative_to(folder_path)
-                zipf.write(file_path, arcname)
+    # ZipFile serialises reads of the shared archive, so members can be opened concurrently
+    targets = [target for target, _ in members.values()]
+    infos = [info for _, info in members.values()]
+    digests = {}
+    with ThreadPoolExecutor(max_workers=EXTRACT_WORKERS) as pool:
+        results = pool.map(extract_member, repeat(zip_ref), infos, targets)
+        for target, digest in zip(targets, results):
+            if digest is not None:
+                digests[target] = digest
     
-    zip_buffer.seek(0)
-    return zip_buffer.getvalue()
+    return digests
 
 
-def handle_uploaded_zip(uploaded_zip, preserve_structure=True):
+def handle_uploaded_zip(uploaded_zip, preserve_structure=True, backend=BACKEND_OFFICE, fast_docx=False):
     """Extract and process uploaded ZIP file."""
-    if not zipfile.is_zipfile(uploaded_zip):
+    # Opening the archive validates it, so no separate is_zipfile() scan is needed.
+    # The upload is already in memory (it has no file descriptor to mmap), and
+    # ZipFile only reads the central directory at its end before extraction.
+    uploaded_zip.seek(0)
+    try:
+        zip_ref = zipfile.ZipFile(uploaded_zip, "r")
+    except zipfile.BadZipFile:
         st.error("The uploaded file is not a valid ZIP file.")
         return [], []
 
@@ -294,34 +892,40 @@ def handle_uploaded_zip(uploaded_zip, preserve_structure=True):
         extract_dir = Path(temp_dir) / "extracted"
         extract_dir.mkdir()
         
-        zip_path = Path(temp_dir) / "uploaded.zip"
-        with open(zip_path, "wb") as f:
-            f.write(uploaded_zip.getvalue())
-
-        with zipfile.ZipFile(zip_path, "r") as zip_ref:
-            zip_ref.extractall(extract_dir)
+        # Extract straight from the upload instead of staging a copy on disk.
+        # Content digests let duplicate documents in the archive be converted only once.
+        with zip_ref:
+            digests = extract_zip(zip_ref, extract_dir)
 
         # Process files
         output_dir = Path(temp_dir) / "converted"
         st.info("Files extracted. Converting to PDFs...")
         
-        converted_files, skipped_files = process_folder_recursive(
-            extract_dir, 
-            output_dir, 
-            preserve_structure=preserve_structure
-        )
+        # PDFs are zipped (to disk, inside temp_dir) as soon as each one is converted
+        zip_path = Path(temp_dir) / "converted_files.zip"
+        with open(zip_path, "wb") as result_zip, ZipStreamWriter(result_zip, output_dir) as zip_writer:
+            converted_files, skipped_files = process_folder_recursive(
+                extract_dir, 
+                output_dir, 
+                preserve_structure=preserve_structure,
+                backend=backend,
+                on_output=zip_writer.add,
+                fast_docx=fast_docx,
+                digests=digests
+            )
         
-        # Create a ZIP of results
+        # Offer the ZIP of results
         if converted_files:
-            result_zip_data = create_zip_from_folder(output_dir)
-            
-            st.download_button(
-                "📦 Download Converted PDFs",
-                result_zip_data,
-                "converted_files.zip",
-                "application/zip",
-                key="download_zip"
-            )
+            with open(zip_path, "rb") as result_zip:
+                st.download_button(
+                    "📦 Download Converted PDFs",
+                    result_zip,
+                    "converted_files.zip",
+                    "application/zip",
+                    key="download_zip",
+                    # Downloading must not rerun the script, which would convert everything again
+                    on_click="ignore"
+                )
         
         return converted_files, skipped_files
 
@@ -337,7 +941,7 @@ st.title("📄 Office Files to PDF Converter")
 st.markdown("Convert **DOC, DOCX, PPT, PPTX** files to PDF format")
 
 # Add system requirements info
-st.info("⚠️ **System Requirements**: This app requires Microsoft Word and PowerPoint to be installed on Windows. Run in Administrator mode for best results.")
+st.info("⚠️ **System Requirements**: The Microsoft Office backend requires Word and PowerPoint on Windows (run in Administrator mode for best results). The LibreOffice backend works on any OS with LibreOffice installed.")
 
 # Create three columns for different input methods
 col1, col2, col3 = st.columns(3)
@@ -384,6 +988,18 @@ preserve_structure = st.checkbox(
     value=True, 
     help="Keep the original folder structure in the output ZIP file"
 )
+backends = [BACKEND_OFFICE, BACKEND_LIBREOFFICE] if OFFICE_AVAILABLE else [BACKEND_LIBREOFFICE]
+backend = st.selectbox(
+    "Conversion backend",
+    backends,
+    help="Microsoft Office uses Word/PowerPoint via COM (Windows only). LibreOffice converts in headless batches."
+)
+fast_docx = st.checkbox(
+    "Fast mode for plain-text .docx",
+    value=False,
+    help="Render .docx files that contain only text (no tables, images or equations) directly to PDF. "
+         "Much faster, but fonts and formatting are not kept."
+)
 
 # Process uploaded files
 if uploaded_zip:
@@ -391,7 +1007,7 @@ if uploaded_zip:
     st.subheader("🔄 Processing ZIP File")
     
     try:
-        converted_files, skipped_files = handle_uploaded_zip(uploaded_zip, preserve_structure)
+        converted_files, skipped_files = handle_uploaded_zip(uploaded_zip, preserve_structure, backend, fast_docx)
         
         if converted_files:
             st.success(f"🎉 Conversion complete! {len(converted_files)} files were processed.")
@@ -412,7 +1028,7 @@ if uploaded_zip:
     except Exception as e:
         st.error(f"An error occurred during processing: {e}")
         st.write("**Troubleshooting tips:**")
-        st.write("- Ensure Microsoft Word and PowerPoint are installed")
+        st.write("- Ensure Microsoft Word and PowerPoint (or LibreOffice) are installed")
         st.write("- Check that the ZIP file contains valid Office files")
         st.write("- Try running the app as administrator")
         st.write("- Close any open Office applications before running")
@@ -426,23 +1042,26 @@ if folder_files:
     create_folder_structure_info(folder_files)
     
     try:
-        converted_files, skipped_files, output_dir = process_uploaded_files_with_structure(
+        converted_files, skipped_files, result_zip = process_uploaded_files_with_structure(
             folder_files, 
-            preserve_structure
+            preserve_structure,
+            backend,
+            fast_docx
         )
         
         if converted_files:
             st.success(f"🎉 Conversion complete! {len(converted_files)} files were processed.")
             
             # Create download
-            result_zip_data = create_zip_from_folder(output_dir)
-            st.download_button(
-                "📦 Download Converted PDFs",
-                result_zip_data,
-                "converted_files.zip",
-                "application/zip",
-                key="download_folder"
-            )
+            with result_zip:
+                st.download_button(
+                    "📦 Download Converted PDFs",
+                    zip_download_data(result_zip),
+                    "converted_files.zip",
+                    "application/zip",
+                    key="download_folder",
+                    on_click="ignore"
+                )
             
             # Show summary
             with st.expander("📋 Conversion Summary", expanded=True):
@@ -454,6 +1073,7 @@ if folder_files:
                     for skipped in skipped_files:
                         st.write(f"• {skipped}")
         else:
+            result_zip.close()
             st.warning("No files were converted.")
             handle_folder_upload_alternative()
     
@@ -466,47 +1086,55 @@ if uploaded_files:
     st.markdown("---")
     st.subheader("🔄 Processing Individual Files")
     
-    with tempfile.TemporaryDirectory() as temp_dir:
+    with tempfile.TemporaryDirectory(dir=upload_temp_dir(uploaded_files)) as temp_dir:
         input_dir = Path(temp_dir) / "input"
         output_dir = Path(temp_dir) / "output"
         input_dir.mkdir()
         output_dir.mkdir()
         
-        # Save uploaded files
+        # Save uploaded files; Word and PowerPoint need a real path, so they are
+        # written once to the (RAM-backed when it has room) temporary directory
+        file_paths = []
         for uploaded_file in uploaded_files:
             file_path = input_dir / uploaded_file.name
-            with open(file_path, "wb") as f:
-                f.write(uploaded_file.getvalue())
-        
-        # Convert files
-        converted_files, skipped_files = process_folder_recursive(
-            input_dir, 
-            output_dir, 
-            preserve_structure=False
-        )
+            save_uploaded_file(uploaded_file, file_path)
+            file_paths.append(file_path)
         
-        if converted_files:
-            st.success(f"🎉 Conversion complete! {len(converted_files)} files were processed.")
+        # Convert files (the uploads are a flat list, so no folder walk is needed),
+        # zipping each PDF in the background as soon as it is ready
+        result_zip = tempfile.SpooledTemporaryFile(max_size=ZIP_SPOOL_SIZE, suffix=".zip")
+        with result_zip:
+            with ZipStreamWriter(result_zip, output_dir) as zip_writer:
+                converted_files, skipped_files = process_files(
+                    file_paths, 
+                    output_dir, 
+                    backend=backend,
+                    on_output=zip_writer.add,
+                    fast_docx=fast_docx
+                )
             
-            # Create download
-            result_zip_data = create_zip_from_folder(output_dir)
-            st.download_button(
-                "📦 Download Converted PDFs",
-                result_zip_data,
-                "converted_files.zip",
-                "application/zip",
-                key="download_individual"
-            )
-            
-            # Show summary
-            with st.expander("📋 Conversion Summary", expanded=True):
-                for file_info in converted_files:
-                    st.write(f"✅ {file_info['original']} → {file_info['pdf']} ({file_info['type']})")
+            if converted_files:
+                st.success(f"🎉 Conversion complete! {len(converted_files)} files were processed.")
                 
-                if skipped_files:
-                    st.write("**Skipped files:**")
-                    for skipped in skipped_files:
-                        st.write(f"• {skipped}")
+                # Create download
+                st.download_button(
+                    "📦 Download Converted PDFs",
+                    zip_download_data(result_zip),
+                    "converted_files.zip",
+                    "application/zip",
+                    key="download_individual",
+                    on_click="ignore"
+                )
+                
+                # Show summary
+                with st.expander("📋 Conversion Summary", expanded=True):
+                    for file_info in converted_files:
+                        st.write(f"✅ {file_info['original']} → {file_info['pdf']} ({file_info['type']})")
+                    
+                    if skipped_files:
+                        st.write("**Skipped files:**")
+                        for skipped in skipped_files:
+                            st.write(f"• {skipped}")
 
 # Add footer with usage instructions
 st.markdown("---")
@@ -530,6 +1158,7 @@ st.markdown("""
 - **Folder Structure**: File paths in names (e.g., "subfolder/file.docx") will be preserved
 
 ### 🔧 Technical Notes:
+- Choose the LibreOffice backend when Microsoft Office is not available
 - Close all Office applications before conversion
 - Run in Administrator mode for best results
 - Large files may take longer to process
@@ -0,0 +1,548 @@
+# FileName: office_converter.py
+# Description: Office to PDF conversion helpers used by Word_Powerpoint_TO_pdf.py.
+# Kept in a separate module so worker processes can import them without
+# re-running the Streamlit app.
+# Requirements:
+# pip install pywin32 (Microsoft Office backend, Windows only)
+# or LibreOffice installed with `soffice` on the PATH (LibreOffice backend;
+# with pyuno importable, it is kept running between conversions)
+import atexit
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+from docx import Document
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.utils import simpleSplit
+from reportlab.pdfgen import canvas
+
+try:
+    import pythoncom
+    import win32com.client
+    import win32gui
+    import win32process
+except ImportError:  # Not on Windows or pywin32 missing: only LibreOffice can be used
+    pythoncom = None
+
+try:
+    import uno
+    from com.sun.star.beans import PropertyValue
+    from com.sun.star.connection import NoConnectException
+except ImportError:  # pyuno ships with LibreOffice's own Python (or the python3-uno package)
+    uno = None
+
+OFFICE_AVAILABLE = pythoncom is not None
+UNO_AVAILABLE = uno is not None
+
+# Supported Office file extensions (lower-case, with the leading dot)
+WORD_EXTS = frozenset({'.doc', '.docx'})
+PPT_EXTS = frozenset({'.ppt', '.pptx'})
+OFFICE_EXTS = WORD_EXTS | PPT_EXTS
+
+# Usual install location when soffice is not on the PATH (Windows)
+SOFFICE_WINDOWS_PATH = r"C:\Program Files\LibreOffice\program\soffice.exe"
+
+# Seconds one Office conversion may take before its instance is killed and restarted
+CONVERT_TIMEOUT = 120
+
+# Extra attempts for a file whose Office instance crashed or stopped responding,
+# waiting RETRY_DELAY, then twice as long, ... seconds before each one
+CONVERT_RETRIES = 2
+RETRY_DELAY = 1.0
+
+# Files passed per soffice invocation (keeps the command line within OS limits)
+SOFFICE_BATCH_SIZE = 100
+
+# Seconds to wait for a LibreOffice daemon to accept UNO connections after it starts
+UNO_CONNECT_TIMEOUT = 30
+
+# LibreOffice PDF export filter for each supported extension
+PDF_EXPORT_FILTERS = {
+    **dict.fromkeys(WORD_EXTS, 'writer_pdf_Export'),
+    **dict.fromkeys(PPT_EXTS, 'impress_pdf_Export'),
+}
+
+# Layout used by the reportlab fast path for plain-text documents
+FAST_FONT = "Helvetica"
+FAST_FONT_SIZE = 11
+FAST_LEADING = 14
+FAST_MARGIN = 72  # 1 inch
+
+# Word XML elements the fast path cannot render (images, embedded objects, equations)
+RICH_CONTENT_TAGS = ('}drawing', '}pict', '}object', '}oMath', '}oMathPara')
+
+
+def window_pid(hwnd):
+    """Return the id of the process owning a window, or None if it cannot be found."""
+    try:
+        _, pid = win32process.GetWindowThreadProcessId(hwnd)
+    except Exception:
+        return None
+    return pid or None
+
+
+def kill_process(pid):
+    """Terminate an Office process that stopped responding; a blocked COM call then fails."""
+    if pid is None:
+        return
+    try:
+        os.kill(pid, signal.SIGTERM)  # TerminateProcess on Windows
+    except OSError:
+        pass  # Already gone
+
+
+class WordSession:
+    """Keep one Microsoft Word instance alive across many conversions (Windows only)."""
+
+    def __init__(self):
+        self.word = None
+        self.pid = None
+
+    def __enter__(self):
+        pythoncom.CoInitialize()
+        try:
+            # DispatchEx always starts a private instance instead of attaching to the user's Word
+            self.word = win32com.client.DispatchEx("Word.Application")
+            self.word.Visible = False
+            self.word.DisplayAlerts = 0  # wdAlertsNone: never block on a dialog
+            self.pid = self._find_pid()
+        except Exception:
+            pythoncom.CoUninitialize()
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if self.word is not None:
+                self.word.Quit()
+        finally:
+            self.word = None
+            pythoncom.CoUninitialize()
+
+    def _find_pid(self):
+        """Return the Word process id, or None (the watchdog then cannot kill it)."""
+        # Word has no Application.Hwnd: a unique caption finds its (hidden) window
+        try:
+            self.word.Caption = f"office-doc2pdf {os.getpid()}-{id(self)}"
+            return window_pid(win32gui.FindWindow("OpusApp", self.word.Caption))
+        except Exception:
+            return None
+
+    def is_alive(self):
+        """Return True if the Word instance still answers COM calls."""
+        try:
+            self.word.Version
+            return True
+        except Exception:
+            return False
+
+    def kill(self):
+        """Terminate the Word process, e.g. when a conversion hangs."""
+        kill_process(self.pid)
+
+    def convert(self, doc_path, pdf_path):
+        """Convert a DOC/DOCX file to a PDF using the running Word instance."""
+        try:
+            doc = self.word.Documents.Open(str(doc_path))
+            try:
+                doc.SaveAs(str(pdf_path), FileFormat=17)  # 17 is the PDF format ID in Word
+            finally:
+                doc.Close(False)  # Never leave a document open in the shared instance
+        except Exception as e:
+            raise ValueError(f"Could not convert {doc_path}: {e}")
+
+
+class PowerPointSession:
+    """Keep one Microsoft PowerPoint instance alive across many conversions (Windows only)."""
+
+    def __init__(self):
+        self.powerpoint = None
+        self.pid = None
+
+    def __enter__(self):
+        pythoncom.CoInitialize()
+        try:
+            self.powerpoint = win32com.client.DispatchEx("PowerPoint.Application")
+            self.powerpoint.Visible = True  # PowerPoint sometimes needs to be visible
+            self.powerpoint.DisplayAlerts = 1  # ppAlertsNone: never block on a dialog
+            self.pid = self._find_pid()
+        except Exception:
+            pythoncom.CoUninitialize()
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if self.powerpoint is not None:
+                self.powerpoint.Quit()
+        finally:
+            self.powerpoint = None
+            pythoncom.CoUninitialize()
+
+    def _find_pid(self):
+        """Return the PowerPoint process id, or None (the watchdog then cannot kill it)."""
+        try:
+            return window_pid(self.powerpoint.HWND)
+        except Exception:
+            return None
+
+    def is_alive(self):
+        """Return True if the PowerPoint instance still answers COM calls."""
+        try:
+            self.powerpoint.Version
+            return True
+        except Exception:
+            return False
+
+    def kill(self):
+        """Terminate the PowerPoint process, e.g. when a conversion hangs."""
+        kill_process(self.pid)
+
+    def convert(self, pptx_path, pdf_path):
+        """Convert a PPT/PPTX file to a PDF using the running PowerPoint instance."""
+        try:
+            presentation = self.powerpoint.Presentations.Open(str(pptx_path))
+            try:
+                presentation.SaveAs(str(pdf_path), FileFormat=32)  # 32 is the PDF format ID in PowerPoint
+            finally:
+                presentation.Close()
+        except Exception as e:
+            raise ValueError(f"Could not convert {pptx_path}: {e}")
+
+
+def convert_doc_to_pdf(doc_path, pdf_path):
+    """Convert a DOC/DOCX file to a PDF using Microsoft Word (Windows only)."""
+    with WordSession() as word:
+        word.convert(doc_path, pdf_path)
+
+
+def convert_pptx_to_pdf(pptx_path, pdf_path):
+    """Convert a PPT/PPTX file to a PDF using Microsoft PowerPoint (Windows only)."""
+    with PowerPointSession() as powerpoint:
+        powerpoint.convert(pptx_path, pdf_path)
+
+
+def is_valid_office_file(file_path):
+    """Check if the file is a valid Office document based on its extension."""
+    return file_path.suffix.lower() in OFFICE_EXTS
+
+
+def convert_file_to_pdf(file_path, output_dir, session=None):
+    """Convert a single office file to PDF based on its type.
+
+    output_dir must already exist. If an open WordSession/PowerPointSession
+    is given it is reused instead of starting a new Office instance for this file.
+    """
+    file_path = Path(file_path)
+    output_dir = Path(output_dir)
+    
+    # Generate PDF path
+    pdf_path = output_dir / f"{file_path.stem}.pdf"
+    
+    suffix = file_path.suffix.lower()
+    try:
+        if session is not None:
+            session.convert(file_path, pdf_path)
+        elif suffix in WORD_EXTS:
+            convert_doc_to_pdf(file_path, pdf_path)
+        elif suffix in PPT_EXTS:
+            convert_pptx_to_pdf(file_path, pdf_path)
+        else:
+            raise ValueError(f"Unsupported file type: {file_path.suffix}")
+        
+        return pdf_path
+    except Exception as e:
+        raise ValueError(f"Failed to convert {file_path.name}: {e}")
+
+
+# Worker process state: one persistent Office session per application kind
+SESSION_CLASSES = {
+    'word': WordSession,
+    'powerpoint': PowerPointSession,
+}
+_worker_sessions = {}
+
+
+def _close_worker_sessions():
+    """Quit every Office instance owned by this worker process."""
+    while _worker_sessions:
+        _, session = _worker_sessions.popitem()
+        try:
+            session.__exit__(None, None, None)
+        except Exception:
+            pass
+    pythoncom.CoUninitialize()
+
+
+def init_worker():
+    """ProcessPoolExecutor initializer: prepare COM once for this worker process."""
+    pythoncom.CoInitialize()
+    atexit.register(_close_worker_sessions)
+
+
+def _discard_worker_session(kind):
+    """Kill and forget this worker's Office instance of the given kind."""
+    session = _worker_sessions.pop(kind, None)
+    if session is None:
+        return
+    session.kill()  # First, so Quit() cannot block on a hung instance
+    try:
+        session.__exit__(None, None, None)
+    except Exception:
+        pass
+
+
+def convert_in_worker(file_path, output_dir, kind):
+    """Convert one file inside a worker process, reusing its Office instance.
+
+    Workers outlive a single conversion run, so an instance that was closed
+    or crashed in the meantime is replaced by a new one. A conversion taking
+    longer than CONVERT_TIMEOUT kills the instance and fails with TimeoutError;
+    a file whose instance crashed or stopped responding is retried up to
+    CONVERT_RETRIES times with a fresh instance.
+    """
+    for attempt in range(CONVERT_RETRIES + 1):
+        session = _worker_sessions.get(kind)
+        if session is not None and not session.is_alive():
+            _discard_worker_session(kind)
+            session = None
+        if session is None:
+            session = SESSION_CLASSES[kind]().__enter__()
+            _worker_sessions[kind] = session
+        
+        # COM calls cannot move to another thread, so the watchdog kills the
+        # Office process instead, which makes the blocked call return an error
+        timed_out = threading.Event()
+
+        def on_timeout():
+            timed_out.set()
+            session.kill()
+
+        watchdog = threading.Timer(CONVERT_TIMEOUT, on_timeout)
+        watchdog.start()
+        try:
+            return convert_file_to_pdf(file_path, output_dir, session)
+        except Exception:
+            if timed_out.is_set():
+                _discard_worker_session(kind)
+                raise TimeoutError(f"Conversion of {Path(file_path).name} took longer than "
+                                   f"{CONVERT_TIMEOUT} seconds")
+            if attempt == CONVERT_RETRIES or session.is_alive():
+                raise  # The document itself failed to convert
+            _discard_worker_session(kind)
+        finally:
+            watchdog.cancel()
+        
+        time.sleep(RETRY_DELAY * 2 ** attempt)
+
+
+def find_soffice():
+    """Return the path of the LibreOffice `soffice` executable, or None if not installed."""
+    soffice = shutil.which("soffice") or shutil.which("libreoffice")
+    if soffice is None and os.path.isfile(SOFFICE_WINDOWS_PATH):
+        soffice = SOFFICE_WINDOWS_PATH
+    return soffice
+
+
+def convert_with_soffice(paths, out_dir):
+    """Convert many Office files into one output directory with headless LibreOffice.
+
+    All files are passed to a single `soffice` invocation (per batch of
+    SOFFICE_BATCH_SIZE) so LibreOffice starts once instead of once per file.
+    A private profile keeps soffice from handing the files to an already
+    running LibreOffice instance. out_dir must already exist. Returns a dict mapping each input path to its PDF path, or None when
+    LibreOffice did not produce an output for that file.
+    """
+    soffice = find_soffice()
+    if soffice is None:
+        raise ValueError("LibreOffice (soffice) was not found. Install LibreOffice or add it to the PATH.")
+    
+    paths = [Path(path) for path in paths]
+    out_dir = Path(out_dir)
+    
+    profile_dir = tempfile.mkdtemp(prefix="office-doc2pdf-lo-")
+    try:
+        for start in range(0, len(paths), SOFFICE_BATCH_SIZE):
+            batch = paths[start:start + SOFFICE_BATCH_SIZE]
+            try:
+                subprocess.run(
+                    [soffice, "--headless", f"-env:UserInstallation={Path(profile_dir).as_uri()}",
+                     "--convert-to", "pdf", "--outdir", str(out_dir), *map(str, batch)],
+                    check=True,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE
+                )
+            except subprocess.CalledProcessError as e:
+                raise ValueError(f"LibreOffice failed: {e.stderr.decode(errors='replace').strip() or e}")
+    finally:
+        shutil.rmtree(profile_dir, ignore_errors=True)
+    
+    results = {}
+    for path in paths:
+        pdf_path = out_dir / f"{path.stem}.pdf"
+        results[path] = pdf_path if pdf_path.is_file() else None
+    return results
+
+
+def uno_property(name, value):
+    """Build a com.sun.star.beans.PropertyValue for UNO calls."""
+    prop = PropertyValue()
+    prop.Name = name
+    prop.Value = value
+    return prop
+
+
+class LibreOfficeDaemon:
+    """Keep one headless LibreOffice process running and convert files in it through UNO.
+
+    Unlike convert_with_soffice, LibreOffice is started once for many runs
+    instead of once per folder. The process is started on first use (and
+    again if it died) with its own user profile, so several daemons and a
+    desktop LibreOffice can run side by side. Requires pyuno (UNO_AVAILABLE).
+    """
+
+    def __init__(self):
+        self.process = None
+        self.desktop = None
+        self.profile_dir = None
+
+    def __enter__(self):
+        soffice = find_soffice()
+        if soffice is None:
+            raise ValueError("LibreOffice (soffice) was not found. Install LibreOffice or add it to the PATH.")
+        
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        connection = f"socket,host=127.0.0.1,port={port};urp;StarOffice.ComponentContext"
+        
+        self.profile_dir = tempfile.mkdtemp(prefix="office-doc2pdf-lo-")
+        self.process = subprocess.Popen(
+            [soffice, "--headless", "--invisible", "--nologo", "--norestore", "--nodefault",
+             f"-env:UserInstallation={Path(self.profile_dir).as_uri()}", f"--accept={connection}"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        
+        local_context = uno.getComponentContext()
+        resolver = local_context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local_context)
+        deadline = time.monotonic() + UNO_CONNECT_TIMEOUT
+        while True:
+            try:
+                context = resolver.resolve(f"uno:{connection}")
+                break
+            except NoConnectException:
+                if self.process.poll() is not None or time.monotonic() > deadline:
+                    self.__exit__(None, None, None)
+                    raise ValueError("LibreOffice did not accept UNO connections")
+                time.sleep(0.2)
+        
+        self.desktop = context.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", context)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if self.desktop is not None:
+                self.desktop.terminate()
+        except Exception:
+            pass  # The process is gone or unreachable; it is killed below
+        finally:
+            self.desktop = None
+            if self.process is not None:
+                try:
+                    self.process.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    self.process.kill()
+                self.process = None
+            if self.profile_dir is not None:
+                shutil.rmtree(self.profile_dir, ignore_errors=True)
+                self.profile_dir = None
+
+    def is_alive(self):
+        """Return True if the LibreOffice process is running and connected."""
+        return self.desktop is not None and self.process.poll() is None
+
+    def convert(self, file_path, output_dir):
+        """Convert one Office file into output_dir (which must exist) and return the PDF path."""
+        file_path = Path(file_path)
+        pdf_path = Path(output_dir) / f"{file_path.stem}.pdf"
+        if not self.is_alive():
+            self.__exit__(None, None, None)
+            self.__enter__()
+        
+        try:
+            document = self.desktop.loadComponentFromURL(
+                file_path.resolve().as_uri(), "_blank", 0, (uno_property("Hidden", True),))
+            if document is None:
+                raise ValueError("the document could not be opened")
+            try:
+                export_filter = PDF_EXPORT_FILTERS[file_path.suffix.lower()]
+                document.storeToURL(pdf_path.resolve().as_uri(), (uno_property("FilterName", export_filter),))
+            finally:
+                document.close(True)
+        except Exception as e:
+            raise ValueError(f"Failed to convert {file_path.name}: {e}")
+        return pdf_path
+
+
+def is_simple_docx(doc):
+    """Check whether a python-docx Document only contains plain paragraphs of text."""
+    if doc.tables or doc.inline_shapes:
+        return False
+    
+    for element in doc.element.body.iter():
+        if isinstance(element.tag, str) and element.tag.endswith(RICH_CONTENT_TAGS):
+            return False
+    
+    # The built-in PDF fonts only cover the Windows-1252 character set
+    try:
+        "".join(paragraph.text for paragraph in doc.paragraphs).encode("cp1252")
+    except UnicodeEncodeError:
+        return False
+    return True
+
+
+def fast_convert_simple_docx(docx_path, pdf_path):
+    """Render a text-only DOCX straight to PDF with reportlab, without Office.
+
+    Only paragraph text is kept (no fonts, styles or layout). Returns False,
+    leaving no PDF behind, when the document is not simple enough or cannot
+    be read or rendered, so the caller can fall back to a full conversion.
+    """
+    try:
+        doc = Document(str(docx_path))
+        if not is_simple_docx(doc):
+            return False
+    except Exception:
+        return False
+    
+    width, height = letter
+    text_width = width - 2 * FAST_MARGIN
+    try:
+        pdf = canvas.Canvas(str(pdf_path), pagesize=letter)
+        pdf.setFont(FAST_FONT, FAST_FONT_SIZE)
+        y = height - FAST_MARGIN
+        
+        for paragraph in doc.paragraphs:
+            # Empty paragraphs still take up one line, as in Word
+            lines = simpleSplit(paragraph.text, FAST_FONT, FAST_FONT_SIZE, text_width) or [""]
+            for line in lines:
+                if y < FAST_MARGIN:
+                    pdf.showPage()
+                    pdf.setFont(FAST_FONT, FAST_FONT_SIZE)
+                    y = height - FAST_MARGIN
+                pdf.drawString(FAST_MARGIN, y, line)
+                y -= FAST_LEADING
+        
+        pdf.save()
+    except Exception:
+        # e.g. text the standard font cannot encode, or an unwritable output path
+        Path(pdf_path).unlink(missing_ok=True)
+        return False
+    return True